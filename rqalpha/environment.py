@@ -202,5 +202,8 @@ class Environment(object):
     def get_order_transaction_cost(self, account_type, order):
         return self._get_transaction_cost_decider(account_type).get_order_transaction_cost(order)
 
+    def get_order_transaction_costs(self, account_type, orders):
+        return self._get_transaction_cost_decider(account_type).get_order_transaction_costs(orders)
+
     def set_benchmark_provider(self, benchmark_provider):
         self.benchmark_provider = benchmark_provider
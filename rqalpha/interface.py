@@ -659,6 +659,15 @@ class AbstractTransactionCostDecider((with_metaclass(abc.ABCMeta))):
     def get_order_transaction_cost(self, order):
         raise NotImplementedError
 
+    def get_order_transaction_costs(self, orders):
+        """
+        批量计算订单的预估税费，默认逐个调用 get_order_transaction_cost，可重写以实现向量化的计算
+
+        :param orders: list[:class:`~Order`]
+        :return: list[float] 或 numpy.ndarray
+        """
+        return [self.get_order_transaction_cost(order) for order in orders]
+
 
 class AbstractBenchmarkProvider(with_metaclass(abc.ABCMeta)):
     """
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2017 Ricequant, Inc
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+
+def margin_of_array(quantity, contract_multiplier, price, margin_rate, margin_multiplier):
+    """
+    批量计算保证金，与 margin_of 的计算方式一致
+
+    :param quantity: np.ndarray[float64] 数量
+    :param contract_multiplier: np.ndarray[float64] 合约乘数
+    :param price: np.ndarray[float64] 价格
+    :param margin_rate: np.ndarray[float64] 保证金率
+    :param margin_multiplier: float 保证金倍率
+    :return: np.ndarray[float64] 逐项保证金
+    """
+    margin = np.multiply(quantity, contract_multiplier)
+    margin *= price
+    margin *= margin_rate
+    margin *= margin_multiplier
+    return margin
@@ -14,7 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
 import six
+from collections import defaultdict
+
+import numpy as np
 
 from rqalpha.model.base_account import BaseAccount
 from rqalpha.environment import Environment
@@ -24,6 +28,7 @@ from rqalpha.utils.i18n import gettext as _
 from rqalpha.utils.logger import user_system_log
 
 from ..api.api_future import order
+from ._margin_kernel import margin_of_array
 
 
 def margin_of(order_book_id, quantity, price):
@@ -42,8 +47,15 @@ class FutureAccount(BaseAccount):
 
     forced_liquidation = True
 
+    def __init__(self, total_cash, positions, backward_trade_set=None, register_event=True):
+        self._env = Environment.get_instance()
+        super(FutureAccount, self).__init__(total_cash, positions, backward_trade_set, register_event)
+        # 上一次 fast_forward 时的活跃订单 {order_id: order}，用于增量计算 frozen_cash；
+        # 订单事件会按成交比例调整 frozen_cash，与快照的口径不一致，因此事件处理后快照失效，下一次回退到全量计算
+        self._active_snapshot = None
+
     def register_event(self):
-        event_bus = Environment.get_instance().event_bus
+        event_bus = self._env.event_bus
         event_bus.add_listener(EVENT.TRADE, self._on_trade)
         event_bus.add_listener(EVENT.ORDER_PENDING_NEW, self._on_order_pending_new)
         event_bus.add_listener(EVENT.ORDER_CREATION_REJECT, self._on_order_unsolicited_update)
@@ -54,10 +66,14 @@ class FutureAccount(BaseAccount):
             event_bus.add_listener(EVENT.BAR, self._update_last_price)
             event_bus.add_listener(EVENT.TICK, self._update_last_price)
 
-    def fast_forward(self, orders, trades=None):
+    def fast_forward(self, orders, trades=None, incremental=False):
+        """
+        :param incremental: 为 True 时，frozen_cash 仅根据与上一次 fast_forward 相比新增和失效的活跃订单增量更新，
+            调用方需保证当前 frozen_cash 与上一次 fast_forward 之后的订单状态一致
+        """
         # 计算 Positions
         if trades:
-            close_trades = []
+            close_trades = defaultdict(list)
             # 先处理开仓
             for trade in trades:
                 if trade.exec_id in self._backward_trade_set:
@@ -65,80 +81,79 @@ class FutureAccount(BaseAccount):
                 if trade.position_effect == POSITION_EFFECT.OPEN:
                     self._apply_trade(trade)
                 else:
-                    close_trades.append(trade)
-            # 后处理平仓
-            for trade in close_trades:
-                self._apply_trade(trade)
+                    close_trades[trade.order_book_id].append(trade)
+            # 后处理平仓，同一合约的平仓成交共用一次持仓查找
+            for order_book_id, trades_of_position in six.iteritems(close_trades):
+                position = self._positions.get_or_create(order_book_id)
+                for trade in trades_of_position:
+                    self._apply_trade(trade, position=position)
 
         # 计算 Frozen Cash
-        self._frozen_cash = sum(self._frozen_cash_of_order(order) for order in orders if order.is_active())
+        if incremental and self._active_snapshot is not None:
+            self._fast_forward_frozen_cash(orders)
+            return
+
+        env = self._env
+        margin_multiplier = env.config.base.margin_multiplier
+        active_orders = [order for order in orders if order.is_active()]
+        self._active_snapshot = {order.order_id: order for order in active_orders}
+        open_orders = [order for order in active_orders if order.position_effect == POSITION_EFFECT.OPEN]
+        instruments = {
+            order_book_id: env.get_instrument(order_book_id)
+            for order_book_id in {order.order_book_id for order in open_orders}
+        }
+        count = len(open_orders)
+        quantity = np.fromiter((order.quantity for order in open_orders), dtype=np.float64, count=count)
+        contract_multiplier = np.fromiter((
+            instruments[order.order_book_id].contract_multiplier for order in open_orders
+        ), dtype=np.float64, count=count)
+        price = np.fromiter((order.frozen_price for order in open_orders), dtype=np.float64, count=count)
+        margin_rate = np.fromiter((
+            instruments[order.order_book_id].margin_rate for order in open_orders
+        ), dtype=np.float64, count=count)
+        margin = margin_of_array(quantity, contract_multiplier, price, margin_rate, margin_multiplier)
+        transaction_costs = env.get_order_transaction_costs(DEFAULT_ACCOUNT_TYPE.FUTURE, active_orders)
+        self._frozen_cash = float(margin.sum()) + math.fsum(transaction_costs)
+
+    def _fast_forward_frozen_cash(self, orders):
+        active_orders = {order.order_id: order for order in orders if order.is_active()}
+        snapshot = self._active_snapshot
+        for order_id, order in six.iteritems(snapshot):
+            if order_id not in active_orders:
+                self._frozen_cash -= self._get_order_frozen_cash(order)
+        for order_id, order in six.iteritems(active_orders):
+            if order_id not in snapshot:
+                self._frozen_cash += self._get_order_frozen_cash(order)
+        self._active_snapshot = active_orders
 
     def order(self, order_book_id, quantity, style, target=False):
+        _order = order
+        BUY, SELL = SIDE.BUY, SIDE.SELL
+        OPEN, CLOSE, CLOSE_TODAY = POSITION_EFFECT.OPEN, POSITION_EFFECT.CLOSE, POSITION_EFFECT.CLOSE_TODAY
+
         position = self.positions[order_book_id]
+        buy_old_quantity, buy_today_quantity, sell_old_quantity, sell_today_quantity = position.quantities4
         if target:
             # For order_to
-            quantity = quantity - position.buy_quantity + position.sell_quantity
-        orders = []
+            quantity = quantity - (buy_old_quantity + buy_today_quantity) + (sell_old_quantity + sell_today_quantity)
         if quantity > 0:
-            sell_old_quantity, sell_today_quantity = position.sell_old_quantity, position.sell_today_quantity
-            # 平昨仓
-            if sell_old_quantity > 0:
-                orders.append(order(
-                    order_book_id,
-                    min(quantity, sell_old_quantity),
-                    SIDE.BUY,
-                    POSITION_EFFECT.CLOSE,
-                    style
-                ))
-                quantity -= sell_old_quantity
-            if quantity <= 0:
-                return orders
-            # 平今仓
-            if sell_today_quantity > 0:
-                orders.append(order(
-                    order_book_id,
-                    min(quantity, sell_today_quantity),
-                    SIDE.BUY,
-                    POSITION_EFFECT.CLOSE_TODAY,
-                    style
-                ))
-                quantity -= sell_today_quantity
-            if quantity <= 0:
-                return orders
-            # 开多仓
-            orders.append(order(
-                order_book_id,
-                quantity,
-                SIDE.BUY,
-                POSITION_EFFECT.OPEN,
-                style
-            ))
-            return orders
+            # 先平昨仓，再平今仓，剩余部分开多仓
+            side = BUY
+            legs = ((sell_old_quantity, CLOSE), (sell_today_quantity, CLOSE_TODAY), (float('inf'), OPEN))
         else:
-            # 平昨仓
+            # 先平昨仓，再平今仓，剩余部分开空仓
             quantity *= -1
-            buy_old_quantity, buy_today_quantity = position.buy_old_quantity, position.buy_today_quantity
-            if buy_old_quantity > 0:
-                orders.append(
-                    order(order_book_id, min(quantity, buy_old_quantity), SIDE.SELL, POSITION_EFFECT.CLOSE, style))
-                quantity -= min(quantity, buy_old_quantity)
-            if quantity <= 0:
-                return orders
-            # 平今仓
-            if buy_today_quantity > 0:
-                orders.append(order(
-                    order_book_id,
-                    min(quantity, buy_today_quantity),
-                    SIDE.SELL,
-                    POSITION_EFFECT.CLOSE_TODAY,
-                    style
-                ))
-                quantity -= buy_today_quantity
+            side = SELL
+            legs = ((buy_old_quantity, CLOSE), (buy_today_quantity, CLOSE_TODAY), (float('inf'), OPEN))
+
+        orders = []
+        for closable_quantity, position_effect in legs:
+            if closable_quantity > 0:
+                orders.append(_order(order_book_id, min(quantity, closable_quantity), side, position_effect, style))
+                quantity -= closable_quantity
             if quantity <= 0:
-                return orders
-            # 开空仓
-            orders.append(order(order_book_id, quantity, SIDE.SELL, POSITION_EFFECT.OPEN, style))
-            return orders
+                break
+        return orders
 
     def get_state(self):
         return {
@@ -153,6 +168,7 @@ class FutureAccount(BaseAccount):
 
     def set_state(self, state):
         self._frozen_cash = state['frozen_cash']
+        self._active_snapshot = None
         self._backward_trade_set = set(state['backward_trade_set'])
 
         margin_changed = 0
@@ -169,18 +185,25 @@ class FutureAccount(BaseAccount):
     def type(self):
         return DEFAULT_ACCOUNT_TYPE.FUTURE.name
 
-    @staticmethod
-    def _frozen_cash_of_order(order):
+    def _frozen_cash_of_order(self, order):
         order_cost = margin_of(
             order.order_book_id, order.quantity, order.frozen_price
         ) if order.position_effect == POSITION_EFFECT.OPEN else 0
-        return order_cost + Environment.get_instance().get_order_transaction_cost(
+        return order_cost + self._env.get_order_transaction_cost(
             DEFAULT_ACCOUNT_TYPE.FUTURE, order
         )
 
+    def _get_order_frozen_cash(self, order):
+        # 冻结资金只取决于下单时确定的 frozen_price 和 quantity，在订单生命周期内不变，计算一次后缓存在订单上；
+        # 持久化恢复的订单没有缓存，首次访问时重新计算
+        if order._cached_frozen_cash is None:
+            order._cached_frozen_cash = self._frozen_cash_of_order(order)
+        return order._cached_frozen_cash
+
     @property
     def total_value(self):
-        return self._total_cash + self.margin + self.holding_pnl
+        margin, holding_pnl = self._aggregate_positions()
+        return self._total_cash + margin + holding_pnl
 
     # -- Margin 相关
     @property
@@ -188,21 +211,30 @@ class FutureAccount(BaseAccount):
         """
         [float] 总保证金
         """
-        return sum(position.margin for position in six.itervalues(self._positions))
+        total = 0
+        for position in six.itervalues(self._positions):
+            total += position.margin
+        return total
 
     @property
     def buy_margin(self):
         """
         [float] 买方向保证金
         """
-        return sum(position.buy_margin for position in six.itervalues(self._positions))
+        total = 0
+        for position in six.itervalues(self._positions):
+            total += position.buy_margin
+        return total
 
     @property
     def sell_margin(self):
         """
         [float] 卖方向保证金
         """
-        return sum(position.sell_margin for position in six.itervalues(self._positions))
+        total = 0
+        for position in six.itervalues(self._positions):
+            total += position.sell_margin
+        return total
 
     # -- PNL 相关
     @property
@@ -217,29 +249,49 @@ class FutureAccount(BaseAccount):
         """
         [float] 浮动盈亏
         """
-        return sum(position.holding_pnl for position in six.itervalues(self._positions))
+        total = 0
+        for position in six.itervalues(self._positions):
+            total += position.holding_pnl
+        return total
 
     @property
     def realized_pnl(self):
         """
         [float] 平仓盈亏
         """
-        return sum(position.realized_pnl for position in six.itervalues(self._positions))
+        total = 0
+        for position in six.itervalues(self._positions):
+            total += position.realized_pnl
+        return total
+
+    def _aggregate_positions(self):
+        """
+        单次遍历持仓，返回 (margin, holding_pnl)
+        """
+        margin = holding_pnl = 0
+        for position in six.itervalues(self._positions):
+            margin += position.margin
+            holding_pnl += position.holding_pnl
+        return margin, holding_pnl
 
     def _settlement(self, event):
-        total_value = self.total_value
+        margin, holding_pnl = self._aggregate_positions()
+        total_value = self._total_cash + margin + holding_pnl
 
-        for position in list(self._positions.values()):
-            order_book_id = position.order_book_id
+        to_delete = []
+        for order_book_id, position in six.iteritems(self._positions):
             if position.is_de_listed() and position.buy_quantity + position.sell_quantity != 0:
                 user_system_log.warn(
                     _(u"{order_book_id} is expired, close all positions by system").format(order_book_id=order_book_id))
-                del self._positions[order_book_id]
+                to_delete.append(order_book_id)
             elif position.buy_quantity == 0 and position.sell_quantity == 0:
-                del self._positions[order_book_id]
+                to_delete.append(order_book_id)
             else:
                 position.apply_settlement()
-        self._total_cash = total_value - self.margin - self.holding_pnl
+        for order_book_id in to_delete:
+            del self._positions[order_book_id]
+        margin, holding_pnl = self._aggregate_positions()
+        self._total_cash = total_value - margin - holding_pnl
 
         # 如果 total_value <= 0 则认为已爆仓，清空仓位，资金归0
         if total_value <= 0 and self.forced_liquidation:
@@ -258,37 +310,43 @@ class FutureAccount(BaseAccount):
         if self != event.account:
             return
 
-        self._frozen_cash += self._frozen_cash_of_order(event.order)
+        self._frozen_cash += self._get_order_frozen_cash(event.order)
+        self._active_snapshot = None
 
     def _on_order_unsolicited_update(self, event):
         if self != event.account:
             return
         order = event.order
+        cost = self._get_order_frozen_cash(order)
         if order.filled_quantity != 0:
-            self._frozen_cash -= order.unfilled_quantity / order.quantity * self._frozen_cash_of_order(order)
+            self._frozen_cash -= order.unfilled_quantity / order.quantity * cost
         else:
-            self._frozen_cash -= self._frozen_cash_of_order(event.order)
+            self._frozen_cash -= cost
+        self._active_snapshot = None
 
     def _on_trade(self, event):
         if self != event.account:
             return
         self._apply_trade(event.trade, event.order)
 
-    def _apply_trade(self, trade, order=None):
+    def _apply_trade(self, trade, order=None, position=None):
         if trade.exec_id in self._backward_trade_set:
             return
-        order_book_id = trade.order_book_id
-        position = self._positions.get_or_create(order_book_id)
+        if position is None:
+            position = self._positions.get_or_create(trade.order_book_id)
         delta_cash = position.apply_trade(trade)
 
         self._total_cash -= trade.transaction_cost
         self._total_cash += delta_cash
         self._backward_trade_set.add(trade.exec_id)
         if order:
+            cost = self._get_order_frozen_cash(order)
             if trade.last_quantity != order.quantity:
-                self._frozen_cash -= trade.last_quantity / order.quantity * self._frozen_cash_of_order(order)
+                self._frozen_cash -= cost * (trade.last_quantity / order.quantity)
             else:
-                self._frozen_cash -= self._frozen_cash_of_order(order)
+                self._frozen_cash -= cost
+            self._active_snapshot = None
+
     # ------------------------------------ Abandon Property ------------------------------------
 
     @property
@@ -40,6 +40,10 @@ class FuturePosition(BasePosition):
         self._buy_avg_open_price = 0.
         self._sell_avg_open_price = 0.
 
+        # 持仓列表中 price * quantity 之和的缓存，None 表示需要重新计算
+        self._buy_holding_value_cache = None
+        self._sell_holding_value_cache = None
+
     def __repr__(self):
         return 'FuturePosition({})'.format(self.__dict__)
 
@@ -70,6 +74,7 @@ class FuturePosition(BasePosition):
         self._sell_transaction_cost = state['sell_transaction_cost']
         self._buy_avg_open_price = state['buy_avg_open_price']
         self._sell_avg_open_price = state['sell_avg_open_price']
+        self._invalidate_holding_cost()
 
     @property
     def type(self):
@@ -267,6 +272,13 @@ class FuturePosition(BasePosition):
         """
         return sum(amount for price, amount in self._sell_today_holding_list)
 
+    @property
+    def quantities4(self):
+        """
+        [tuple] (买方向昨仓, 买方向今仓, 卖方向昨仓, 卖方向今仓)
+        """
+        return self.buy_old_quantity, self.buy_today_quantity, self.sell_old_quantity, self.sell_today_quantity
+
     @property
     def buy_quantity(self):
         """
@@ -316,7 +328,7 @@ class FuturePosition(BasePosition):
         [float] 保证金
         """
         # TODO: 需要添加单向大边相关的处理逻辑
-        return self.buy_margin + self.sell_margin
+        return (self._buy_holding_cost + self._sell_holding_cost) * self.margin_rate
 
     @property
     def buy_avg_holding_price(self):
@@ -334,11 +346,19 @@ class FuturePosition(BasePosition):
 
     @property
     def _buy_holding_cost(self):
-        return sum(p * a * self.contract_multiplier for p, a in self.buy_holding_list)
+        if self._buy_holding_value_cache is None:
+            self._buy_holding_value_cache = sum(p * a for p, a in self.buy_holding_list)
+        return self._buy_holding_value_cache * self.contract_multiplier
 
     @property
     def _sell_holding_cost(self):
-        return sum(p * a * self.contract_multiplier for p, a in self.sell_holding_list)
+        if self._sell_holding_value_cache is None:
+            self._sell_holding_value_cache = sum(p * a for p, a in self.sell_holding_list)
+        return self._sell_holding_value_cache * self.contract_multiplier
+
+    def _invalidate_holding_cost(self):
+        self._buy_holding_value_cache = None
+        self._sell_holding_value_cache = None
 
     @property
     def buy_holding_list(self):
@@ -397,6 +417,7 @@ class FuturePosition(BasePosition):
         self._sell_old_holding_list = [(settle_price, self.sell_quantity)]
         self._buy_today_holding_list = []
         self._sell_today_holding_list = []
+        self._invalidate_holding_cost()
 
         self._buy_transaction_cost = 0.
         self._sell_transaction_cost = 0.
@@ -433,6 +454,7 @@ class FuturePosition(BasePosition):
                                             trade_quantity * trade.last_price) / (self.buy_quantity + trade_quantity)
                 self._buy_transaction_cost += trade.transaction_cost
                 self._buy_today_holding_list.insert(0, (trade.last_price, trade_quantity))
+                self._invalidate_holding_cost()
                 return -1 * self._margin_of(trade_quantity, trade.last_price)
             else:
                 old_margin = self.margin
@@ -446,6 +468,7 @@ class FuturePosition(BasePosition):
                                              trade_quantity * trade.last_price) / (self.sell_quantity + trade_quantity)
                 self._sell_transaction_cost += trade.transaction_cost
                 self._sell_today_holding_list.insert(0, (trade.last_price, trade_quantity))
+                self._invalidate_holding_cost()
                 return -1 * self._margin_of(trade_quantity, trade.last_price)
             else:
                 old_margin = self.margin
@@ -517,6 +540,7 @@ class FuturePosition(BasePosition):
                     consumed_quantity = oldest_quantity
                 left_quantity -= consumed_quantity
                 delta += self._cal_realized_pnl(oldest_price, trade.last_price, trade.side, consumed_quantity)
+        self._invalidate_holding_cost()
         return delta
 
     def _cal_realized_pnl(self, cost_price, trade_price, side, consumed_quantity):
@@ -1,4 +1,4 @@
-from rqalpha.utils.testing import EnvironmentFixture
+from rqalpha.utils.testing import EnvironmentFixture, MagicMock
 
 
 class BenchmarkAccountFixture(EnvironmentFixture):
@@ -16,3 +16,44 @@ class BenchmarkAccountFixture(EnvironmentFixture):
         super(BenchmarkAccountFixture, self).init_fixture()
 
         self.benchmark_account = BenchmarkAccount(self.benchmark_account_total_cash,  Positions(StockPosition))
+
+
+class FutureAccountFixture(EnvironmentFixture):
+    def __init__(self, *args, **kwargs):
+        super(FutureAccountFixture, self).__init__(*args, **kwargs)
+
+        self.env_config = {
+            "base": {
+                "margin_multiplier": 1,
+                "round_price": False,
+            }
+        }
+        self.instruments = {}
+        self.last_prices = {}
+        self.settle_prices = {}
+        self.transaction_cost_decider = None
+
+        self.future_account_total_cash = 1000000
+        self.future_account = None
+
+    def init_fixture(self):
+        import datetime
+
+        from rqalpha.const import DEFAULT_ACCOUNT_TYPE
+        from rqalpha.model.base_position import Positions
+        from rqalpha.mod.rqalpha_mod_sys_accounts.position_model.future_position import FuturePosition
+        from rqalpha.mod.rqalpha_mod_sys_accounts.account_model import FutureAccount
+
+        super(FutureAccountFixture, self).init_fixture()
+
+        self.env.trading_dt = self.env.calendar_dt = datetime.datetime(2019, 1, 2, 15)
+        self.env.data_proxy = MagicMock()
+        self.env.data_proxy.instruments.side_effect = lambda order_book_id: self.instruments[order_book_id]
+        self.env.data_proxy.get_last_price.side_effect = lambda order_book_id: self.last_prices[order_book_id]
+        self.env.data_proxy.get_settle_price.side_effect = lambda order_book_id, date: self.settle_prices[
+            order_book_id
+        ]
+        if self.transaction_cost_decider is not None:
+            self.env.set_transaction_cost_decider(DEFAULT_ACCOUNT_TYPE.FUTURE, self.transaction_cost_decider)
+
+        self.future_account = FutureAccount(self.future_account_total_cash, Positions(FuturePosition))
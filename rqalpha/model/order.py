@@ -48,6 +48,8 @@ class Order(object):
         self._type = None
         self._avg_price = None
         self._transaction_cost = None
+        # 账户在下单时计算的冻结资金，由账户模型写入并在订单生命周期内复用
+        self._cached_frozen_cash = None
 
     @staticmethod
     def _enum_to_str(v):
@@ -96,6 +98,7 @@ class Order(object):
         self._type = self._str_to_enum(ORDER_TYPE, d['type'])
         self._transaction_cost = d['transaction_cost']
         self._avg_price = d['avg_price']
+        self._cached_frozen_cash = None
 
     @classmethod
     def __from_create__(cls, order_book_id, quantity, side, style, position_effect):
@@ -0,0 +1,141 @@
+import numpy as np
+
+from rqalpha.utils.testing import RQAlphaTestCase, mock_instrument
+from rqalpha.mod.rqalpha_mod_sys_accounts.testing import FutureAccountFixture
+from rqalpha.interface import AbstractTransactionCostDecider
+from rqalpha.const import SIDE, POSITION_EFFECT, DEFAULT_ACCOUNT_TYPE
+from rqalpha.model.order import Order, LimitOrder
+from rqalpha.model.trade import Trade
+from rqalpha.events import Event, EVENT
+
+
+class PerLotTransactionCostDecider(AbstractTransactionCostDecider):
+    def __init__(self, lot_cost):
+        self.lot_cost = lot_cost
+
+    def get_trade_tax(self, trade):
+        return 0
+
+    def get_trade_commission(self, trade):
+        return 0
+
+    def get_order_transaction_cost(self, order):
+        return self.lot_cost * order.quantity
+
+
+class BatchTransactionCostDecider(PerLotTransactionCostDecider):
+    def __init__(self, lot_cost):
+        super(BatchTransactionCostDecider, self).__init__(lot_cost)
+        self.batches = []
+
+    def get_order_transaction_costs(self, orders):
+        self.batches.append(list(orders))
+        return np.full(len(orders), self.lot_cost * 2, dtype=np.float64)
+
+
+class FutureAccountTestCase(FutureAccountFixture, RQAlphaTestCase):
+    def __init__(self, *args, **kwargs):
+        super(FutureAccountTestCase, self).__init__(*args, **kwargs)
+        self.instruments = {
+            "RB1901": mock_instrument("RB1901", "Future", "XSGE", contract_multiplier=10, margin_rate=0.1),
+        }
+        self.last_prices = {"RB1901": 4000.}
+        self.transaction_cost_decider = PerLotTransactionCostDecider(1)
+
+    @staticmethod
+    def _create_order(quantity, side=SIDE.BUY, position_effect=POSITION_EFFECT.OPEN, price=4000.):
+        order = Order.__from_create__("RB1901", quantity, side, LimitOrder(price), position_effect)
+        order.active()
+        return order
+
+    @staticmethod
+    def _create_trade(order, quantity, price=4000.):
+        return Trade.__from_create__(
+            order.order_id, price, quantity, order.side, order.position_effect, order.order_book_id
+        )
+
+    def test_fast_forward_skips_applied_close_trade(self):
+        order = self._create_order(1, SIDE.SELL, POSITION_EFFECT.CLOSE)
+        trade = self._create_trade(order, 1)
+        self.future_account._backward_trade_set.add(trade.exec_id)
+
+        self.future_account.fast_forward([], [trade])
+        self.assertEqual(len(self.future_account.positions), 0)
+
+    def test_default_order_transaction_costs(self):
+        orders = [self._create_order(1), self._create_order(2, SIDE.SELL, POSITION_EFFECT.CLOSE)]
+        decider = PerLotTransactionCostDecider(3)
+        self.assertEqual(
+            decider.get_order_transaction_costs(orders),
+            [decider.get_order_transaction_cost(order) for order in orders]
+        )
+        self.assertEqual(
+            self.env.get_order_transaction_costs(DEFAULT_ACCOUNT_TYPE.FUTURE, orders),
+            [self.transaction_cost_decider.get_order_transaction_cost(order) for order in orders]
+        )
+
+    def test_fast_forward_uses_batch_transaction_costs(self):
+        decider = BatchTransactionCostDecider(1)
+        self.env.set_transaction_cost_decider(DEFAULT_ACCOUNT_TYPE.FUTURE, decider)
+        orders = [self._create_order(2), self._create_order(1, SIDE.SELL, POSITION_EFFECT.CLOSE)]
+
+        self.future_account.fast_forward(orders)
+        self.assertEqual(decider.batches, [orders])
+        # margin of the OPEN order: 2 * 10 * 4000 * 0.1, plus the batched cost of both orders
+        self.assertAlmostEqual(self.future_account.frozen_cash, 8000 + 2 * 2)
+
+    def test_order_frozen_cash_cache(self):
+        order = self._create_order(2)
+        self.assertIsNone(order._cached_frozen_cash)
+
+        self.env.event_bus.publish_event(Event(EVENT.ORDER_PENDING_NEW, account=self.future_account, order=order))
+        self.assertAlmostEqual(order._cached_frozen_cash, 8002)
+
+        order.set_state(order.get_state())
+        self.assertIsNone(order._cached_frozen_cash)
+        self.env.event_bus.publish_event(
+            Event(EVENT.ORDER_CANCELLATION_PASS, account=self.future_account, order=order)
+        )
+        self.assertAlmostEqual(self.future_account.frozen_cash, 0)
+
+    def assertIncrementalFrozenCash(self, orders):
+        self.future_account.fast_forward(orders, incremental=True)
+        incremental_frozen_cash = self.future_account.frozen_cash
+        self.future_account.fast_forward(orders)
+        self.assertAlmostEqual(incremental_frozen_cash, self.future_account.frozen_cash)
+
+    def test_incremental_fast_forward(self):
+        a, b = self._create_order(1), self._create_order(2)
+        self.future_account.fast_forward([a])
+        self.assertAlmostEqual(self.future_account.frozen_cash, 4001)
+
+        self.future_account.fast_forward([a, b], incremental=True)
+        self.assertAlmostEqual(self.future_account.frozen_cash, 4001 + 8002)
+
+        a.mark_cancelled("", user_warn=False)
+        self.future_account.fast_forward([a, b], incremental=True)
+        self.assertAlmostEqual(self.future_account.frozen_cash, 8002)
+
+    def test_incremental_fast_forward_after_events(self):
+        a, b = self._create_order(1), self._create_order(2)
+        self.future_account.fast_forward([a])
+
+        self.env.event_bus.publish_event(Event(EVENT.ORDER_PENDING_NEW, account=self.future_account, order=b))
+        self.assertAlmostEqual(self.future_account.frozen_cash, 4001 + 8002)
+        self.assertIncrementalFrozenCash([a, b])
+
+        trade = self._create_trade(b, 1)
+        b.fill(trade)
+        self.env.event_bus.publish_event(Event(EVENT.TRADE, account=self.future_account, trade=trade, order=b))
+        self.assertIncrementalFrozenCash([a, b])
+
+        b.mark_cancelled("", user_warn=False)
+        self.env.event_bus.publish_event(
+            Event(EVENT.ORDER_CANCELLATION_PASS, account=self.future_account, order=b)
+        )
+        self.assertIncrementalFrozenCash([a, b])
+
+
+if __name__ == "__main__":
+    import unittest
+    unittest.main()
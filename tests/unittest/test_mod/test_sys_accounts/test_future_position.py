@@ -0,0 +1,77 @@
+from copy import deepcopy
+
+from rqalpha.utils.testing import RQAlphaTestCase, mock_instrument
+from rqalpha.mod.rqalpha_mod_sys_accounts.testing import FutureAccountFixture
+from rqalpha.mod.rqalpha_mod_sys_accounts.position_model.future_position import FuturePosition
+from rqalpha.const import SIDE, POSITION_EFFECT
+from rqalpha.model.trade import Trade
+
+
+class FuturePositionTestCase(FutureAccountFixture, RQAlphaTestCase):
+    def __init__(self, *args, **kwargs):
+        super(FuturePositionTestCase, self).__init__(*args, **kwargs)
+        self.instruments = {
+            "RB1901": mock_instrument("RB1901", "Future", "XSGE", contract_multiplier=10, margin_rate=0.1),
+        }
+        self.last_prices = {"RB1901": 4000.}
+        self.settle_prices = {"RB1901": 4050.}
+
+    @staticmethod
+    def _trade(quantity, price, side, position_effect):
+        return Trade.__from_create__(0, price, quantity, side, position_effect, "RB1901")
+
+    def assertHoldingCost(self, position):
+        contract_multiplier = 10
+        buy_cost = sum(p * a for p, a in position.buy_holding_list) * contract_multiplier
+        sell_cost = sum(p * a for p, a in position.sell_holding_list) * contract_multiplier
+        buy_quantity = sum(a for _, a in position.buy_holding_list)
+        sell_quantity = sum(a for _, a in position.sell_holding_list)
+
+        self.assertAlmostEqual(position.margin, (buy_cost + sell_cost) * 0.1)
+        self.assertAlmostEqual(
+            position.buy_avg_holding_price, buy_cost / buy_quantity / contract_multiplier if buy_quantity else 0
+        )
+        self.assertAlmostEqual(
+            position.sell_avg_holding_price, sell_cost / sell_quantity / contract_multiplier if sell_quantity else 0
+        )
+
+    def test_holding_cost_cache(self):
+        position = FuturePosition("RB1901")
+        self.assertHoldingCost(position)
+
+        position.apply_trade(self._trade(3, 4000., SIDE.BUY, POSITION_EFFECT.OPEN))
+        position.apply_trade(self._trade(2, 4100., SIDE.SELL, POSITION_EFFECT.OPEN))
+        self.assertHoldingCost(position)
+
+        position.apply_settlement()
+        self.assertHoldingCost(position)
+        settled_state = deepcopy(position.get_state())
+
+        position.apply_trade(self._trade(2, 4020., SIDE.BUY, POSITION_EFFECT.OPEN))
+        self.assertHoldingCost(position)
+        # 部分平昨仓
+        position.apply_trade(self._trade(2, 4030., SIDE.SELL, POSITION_EFFECT.CLOSE))
+        self.assertHoldingCost(position)
+        # 平今仓
+        position.apply_trade(self._trade(1, 4040., SIDE.SELL, POSITION_EFFECT.CLOSE_TODAY))
+        self.assertHoldingCost(position)
+        position.apply_trade(self._trade(1, 4060., SIDE.BUY, POSITION_EFFECT.CLOSE))
+        self.assertHoldingCost(position)
+
+        self.settle_prices["RB1901"] = 4070.
+        position.apply_settlement()
+        self.assertHoldingCost(position)
+
+        # 原地恢复到较早的状态
+        position.set_state(settled_state)
+        self.assertHoldingCost(position)
+        self.assertEqual((position.buy_quantity, position.sell_quantity), (3, 2))
+
+        restored = FuturePosition("RB1901")
+        restored.set_state(position.get_state())
+        self.assertAlmostEqual(restored.margin, position.margin)
+
+
+if __name__ == "__main__":
+    import unittest
+    unittest.main()